@@ -5,80 +5,239 @@ Logs WiFi signal strength as you move around and creates a heat map visualizatio
 """
 
 import subprocess
+import sys
 import time
 import json
 import re
 from datetime import datetime
 from pathlib import Path
 
-def get_wifi_signal_strength():
-    """
-    Get current WiFi signal strength for different operating systems.
-    Returns signal strength in dBm (typically -30 to -90, where -30 is excellent, -90 is poor)
-    """
+# orjson is an optional, much faster drop-in for (de)serializing data points
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+# Signal parsers for iwconfig (Linux), airport (macOS) and netsh (Windows)
+_RE_IWCONFIG_SIGNAL = re.compile(r'Signal level[=:](-?\d+)')
+_RE_IWCONFIG_QUALITY = re.compile(r'Link Quality[=:](\d+)/(\d+)')
+_RE_AIRPORT_RSSI = re.compile(r'agrCtlRSSI: (-?\d+)')
+_RE_NETSH_SIGNAL = re.compile(r'Signal\s*:\s*(\d+)%')
+
+def _percent_to_dbm(percentage):
+    """Convert a 0-100 signal quality percentage to approximate dBm."""
+    return int(-100 + (percentage / 100) * 70)
+
+# Native wireless APIs, used before falling back to the command-line tools.
+# The OS handle is opened on first use and kept for the rest of the session.
+_native_handle = None
+_native_failed = False
+
+def _native_linux():
+    """Read the station signal over nl80211 netlink (requires pyroute2)."""
+    global _native_handle
+    from pyroute2 import IW
+    
+    if _native_handle is None:
+        _native_handle = IW()
+    
+    for iface in _native_handle.get_interfaces_dump():
+        ifindex = iface.get_attr('NL80211_ATTR_IFINDEX')
+        for station in _native_handle.get_stations(ifindex):
+            sta_info = station.get_attr('NL80211_ATTR_STA_INFO')
+            signal = sta_info.get_attr('NL80211_STA_INFO_SIGNAL') if sta_info else None
+            if signal is not None:
+                # The kernel reports a signed byte; older pyroute2 decodes it unsigned
+                return signal - 256 if signal > 127 else signal
+    return None
+
+def _native_macos():
+    """Read the RSSI from the CoreWLAN framework (requires pyobjc)."""
+    global _native_handle
+    from CoreWLAN import CWWiFiClient
+    
+    if _native_handle is None:
+        _native_handle = CWWiFiClient.sharedWiFiClient()
+    
+    interface = _native_handle.interface()
+    if interface is None:
+        return None
+    rssi = interface.rssiValue()
+    # CoreWLAN reports 0 when not associated
+    return int(rssi) if rssi else None
+
+# wlanapi.h structures, truncated after the fields we read
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+    
+    class GUID(ctypes.Structure):
+        _fields_ = [('Data1', wintypes.DWORD), ('Data2', wintypes.WORD),
+                    ('Data3', wintypes.WORD), ('Data4', wintypes.BYTE * 8)]
+    
+    class WLAN_INTERFACE_INFO(ctypes.Structure):
+        _fields_ = [('InterfaceGuid', GUID),
+                    ('strInterfaceDescription', wintypes.WCHAR * 256),
+                    ('isState', ctypes.c_int)]
+    
+    class WLAN_INTERFACE_INFO_LIST(ctypes.Structure):
+        _fields_ = [('dwNumberOfItems', wintypes.DWORD), ('dwIndex', wintypes.DWORD),
+                    ('InterfaceInfo', WLAN_INTERFACE_INFO * 1)]
+    
+    class WLAN_ASSOCIATION_ATTRIBUTES(ctypes.Structure):
+        _fields_ = [('uSSIDLength', wintypes.ULONG), ('ucSSID', ctypes.c_ubyte * 32),
+                    ('dot11BssType', ctypes.c_int), ('dot11Bssid', ctypes.c_ubyte * 6),
+                    ('dot11PhyType', ctypes.c_int), ('uDot11PhyIndex', wintypes.ULONG),
+                    ('wlanSignalQuality', wintypes.ULONG), ('ulRxRate', wintypes.ULONG),
+                    ('ulTxRate', wintypes.ULONG)]
+    
+    class WLAN_CONNECTION_ATTRIBUTES(ctypes.Structure):
+        _fields_ = [('isState', ctypes.c_int), ('wlanConnectionMode', ctypes.c_int),
+                    ('strProfileName', wintypes.WCHAR * 256),
+                    ('wlanAssociationAttributes', WLAN_ASSOCIATION_ATTRIBUTES)]
+
+def _native_windows():
+    """Query the current connection through the Native WiFi API (wlanapi.dll)."""
+    global _native_handle
+    wlanapi = ctypes.windll.wlanapi
+    if _native_handle is None:
+        negotiated = wintypes.DWORD()
+        handle = wintypes.HANDLE()
+        if wlanapi.WlanOpenHandle(2, None, ctypes.byref(negotiated), ctypes.byref(handle)):
+            raise OSError("WlanOpenHandle failed")
+        _native_handle = handle
+    
+    iface_list = ctypes.POINTER(WLAN_INTERFACE_INFO_LIST)()
+    if wlanapi.WlanEnumInterfaces(_native_handle, None, ctypes.byref(iface_list)):
+        raise OSError("WlanEnumInterfaces failed")
+    try:
+        count = iface_list.contents.dwNumberOfItems
+        interfaces = (WLAN_INTERFACE_INFO * count).from_address(
+            ctypes.addressof(iface_list.contents.InterfaceInfo))
+        for iface in interfaces:
+            if iface.isState != 1:  # wlan_interface_state_connected
+                continue
+            size = wintypes.DWORD()
+            conn = ctypes.POINTER(WLAN_CONNECTION_ATTRIBUTES)()
+            # 7 = wlan_intf_opcode_current_connection
+            if wlanapi.WlanQueryInterface(_native_handle, ctypes.byref(iface.InterfaceGuid), 7,
+                                          None, ctypes.byref(size), ctypes.byref(conn), None):
+                continue
+            try:
+                return _percent_to_dbm(conn.contents.wlanAssociationAttributes.wlanSignalQuality)
+            finally:
+                wlanapi.WlanFreeMemory(conn)
+    finally:
+        wlanapi.WlanFreeMemory(iface_list)
+    return None
+
+def _poll_linux():
+    """Parse the signal level out of iwconfig."""
     try:
-        # For Linux
         result = subprocess.run(
             ['iwconfig'], 
             capture_output=True, 
             text=True,
             timeout=5
         )
-        
-        # Look for signal level in the output
-        match = re.search(r'Signal level[=:](-?\d+)', result.stdout)
-        if match:
-            return int(match.group(1))
-        
-        # Alternative format
-        match = re.search(r'Link Quality[=:](\d+)/(\d+)', result.stdout)
-        if match:
-            quality = int(match.group(1))
-            max_quality = int(match.group(2))
-            # Convert to approximate dBm (rough estimation)
-            signal_dbm = -100 + (quality / max_quality) * 70
-            return int(signal_dbm)
-            
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        return None
     
+    # Look for signal level in the output
+    output = result.stdout
+    match = _RE_IWCONFIG_SIGNAL.search(output) if 'Signal level' in output else None
+    if match:
+        return int(match.group(1))
+    
+    # Alternative format
+    match = _RE_IWCONFIG_QUALITY.search(output) if 'Link Quality' in output else None
+    if match:
+        quality = int(match.group(1))
+        max_quality = int(match.group(2))
+        # Convert to approximate dBm (rough estimation)
+        signal_dbm = -100 + (quality / max_quality) * 70
+        return int(signal_dbm)
+    
+    return None
+
+def _poll_macos():
+    """Parse the RSSI out of the airport utility."""
     try:
-        # For macOS
         result = subprocess.run(
             ['/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport', '-I'],
             capture_output=True,
             text=True,
             timeout=5
         )
-        
-        match = re.search(r'agrCtlRSSI: (-?\d+)', result.stdout)
-        if match:
-            return int(match.group(1))
-            
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        return None
     
+    match = _RE_AIRPORT_RSSI.search(result.stdout) if 'agrCtlRSSI' in result.stdout else None
+    if match:
+        return int(match.group(1))
+    return None
+
+def _poll_windows():
+    """Parse the signal percentage out of netsh."""
     try:
-        # For Windows (using netsh)
         result = subprocess.run(
             ['netsh', 'wlan', 'show', 'interfaces'],
             capture_output=True,
             text=True,
             timeout=5
         )
-        
-        match = re.search(r'Signal\s*:\s*(\d+)%', result.stdout)
-        if match:
-            percentage = int(match.group(1))
-            # Convert percentage to approximate dBm
-            signal_dbm = -100 + (percentage / 100) * 70
-            return int(signal_dbm)
-            
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        return None
     
+    match = _RE_NETSH_SIGNAL.search(result.stdout) if 'Signal' in result.stdout else None
+    if match:
+        # Convert percentage to approximate dBm
+        return _percent_to_dbm(int(match.group(1)))
     return None
 
+def _poll_unsupported():
+    """No known WiFi tool on this platform."""
+    return None
+
+# Pick the native API and command-line fallback for this OS once, at import
+if sys.platform.startswith('linux'):
+    _native_signal, _poll_signal = _native_linux, _poll_linux
+elif sys.platform == 'darwin':
+    _native_signal, _poll_signal = _native_macos, _poll_macos
+elif sys.platform == 'win32':
+    _native_signal, _poll_signal = _native_windows, _poll_windows
+else:
+    _native_signal, _poll_signal = None, _poll_unsupported
+
+def _native_signal_strength():
+    """
+    Try the platform's native wireless API.
+    Returns None (and stops trying for the session) if it is not available.
+    """
+    global _native_failed
+    if _native_signal is None or _native_failed:
+        return None
+    try:
+        return _native_signal()
+    except Exception:
+        # Missing optional package, no permission, no wireless device, ...
+        _native_failed = True
+        return None
+
+def get_wifi_signal_strength():
+    """
+    Get current WiFi signal strength for different operating systems.
+    Returns signal strength in dBm (typically -30 to -90, where -30 is excellent, -90 is poor)
+    """
+    signal = _native_signal_strength()
+    if signal is not None:
+        return signal
+    return _poll_signal()
+
 def get_manual_position():
     """
     Get manual position input from user (since GPS doesn't work well indoors).
@@ -95,9 +254,10 @@ def get_manual_position():
         print("Invalid input. Using (0, 0)")
         return (0, 0)
 
-def collect_data(data_file='wifi_data.json', interval=2):
+def collect_data(data_file='wifi_data.jsonl', interval=2):
     """
     Continuously collect WiFi signal strength and position data.
+    Points are appended to data_file as line-delimited JSON, one per line.
     """
     print("=" * 60)
     print("WiFi Dead Zone Mapper - Data Collection Mode")
@@ -111,68 +271,78 @@ def collect_data(data_file='wifi_data.json', interval=2):
     
     data_points = []
     
+    # Carry over points from the old single-array wifi_data.json format
+    legacy_file = Path(data_file).with_suffix('.json')
+    if not Path(data_file).exists() and legacy_file.exists():
+        with open(legacy_file, 'rb') as f:
+            legacy_points = _loads(f.read())
+        with open(data_file, 'wb') as out:
+            out.writelines(_dumps(point) + b'\n' for point in legacy_points)
+        print(f"Migrated {len(legacy_points)} data points from {legacy_file} to {data_file}.")
+    
     # Load existing data if available
     if Path(data_file).exists():
-        with open(data_file, 'r') as f:
-            data_points = json.load(f)
+        with open(data_file, 'rb') as f:
+            data_points = [_loads(line) for line in f if line.strip()]
         print(f"Loaded {len(data_points)} existing data points.\n")
     
     point_num = len(data_points) + 1
     
-    while True:
-        user_input = input(f"\nPoint #{point_num} - Press Enter to log signal (or 'done' to finish): ").strip().lower()
-        
-        if user_input == 'done':
-            break
-        
-        # Get WiFi signal
-        signal = get_wifi_signal_strength()
-        
-        if signal is None:
-            print("⚠️  Could not detect WiFi signal. Make sure you're connected to WiFi.")
-            retry = input("Try again? (y/n): ").strip().lower()
-            if retry != 'y':
-                continue
-            else:
-                signal = get_wifi_signal_strength()
-                if signal is None:
-                    print("Still no signal detected. Skipping this point.")
+    # Unbuffered so every point hits the file as soon as it is logged
+    with open(data_file, 'ab', buffering=0) as out:
+        while True:
+            user_input = input(f"\nPoint #{point_num} - Press Enter to log signal (or 'done' to finish): ").strip().lower()
+            
+            if user_input == 'done':
+                break
+            
+            # Get WiFi signal
+            signal = get_wifi_signal_strength()
+            
+            if signal is None:
+                print("⚠️  Could not detect WiFi signal. Make sure you're connected to WiFi.")
+                retry = input("Try again? (y/n): ").strip().lower()
+                if retry != 'y':
                     continue
-        
-        # Get position
-        x, y = get_manual_position()
-        
-        # Optional: add a room label
-        room = input("Room/Area name (optional): ").strip()
-        
-        # Create data point
-        data_point = {
-            'timestamp': datetime.now().isoformat(),
-            'signal_dbm': signal,
-            'x': x,
-            'y': y,
-            'room': room if room else None
-        }
-        
-        data_points.append(data_point)
-        
-        # Display signal quality
-        if signal >= -50:
-            quality = "Excellent"
-        elif signal >= -60:
-            quality = "Good"
-        elif signal >= -70:
-            quality = "Fair"
-        else:
-            quality = "Poor"
-        
-        print(f"✓ Logged: Signal = {signal} dBm ({quality}) at position ({x}, {y})")
-        
-        # Save after each point
-        with open(data_file, 'w') as f:
-            json.dump(data_points, f, indent=2)
-        
-        point_num += 1
+                else:
+                    signal = get_wifi_signal_strength()
+                    if signal is None:
+                        print("Still no signal detected. Skipping this point.")
+                        continue
+            
+            # Get position
+            x, y = get_manual_position()
+            
+            # Optional: add a room label
+            room = input("Room/Area name (optional): ").strip()
+            
+            # Create data point
+            data_point = {
+                'timestamp': datetime.now().isoformat(),
+                'signal_dbm': signal,
+                'x': x,
+                'y': y,
+                'room': room if room else None
+            }
+            
+            data_points.append(data_point)
+            
+            # Display signal quality
+            if signal >= -50:
+                quality = "Excellent"
+            elif signal >= -60:
+                quality = "Good"
+            elif signal >= -70:
+                quality = "Fair"
+            else:
+                quality = "Poor"
+            
+            print(f"✓ Logged: Signal = {signal} dBm ({quality}) at position ({x}, {y})")
+            
+            # Save after each point (append-only, no full rewrite)
+            out.write(_dumps(data_point) + b'\n')
+            
+            point_num += 1
     
     print(f"\n✓ Collected {len(data_points)} total data points")
     print(f"✓ Data saved to {data_file}")
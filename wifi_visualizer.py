@@ -5,21 +5,62 @@ Creates heat map visualizations from collected WiFi signal strength data.
 """
 
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Only ever writes image files; skip GUI backend setup
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
-from scipy.interpolate import griddata
+from matplotlib.tri import Triangulation
+from scipy.interpolate import CloughTocher2DInterpolator
+from scipy.spatial import Delaunay, QhullError, cKDTree
 from pathlib import Path
 
-def load_data(data_file='wifi_data.json'):
-    """Load WiFi data from JSON file."""
+# Use orjson for reading data files when it is installed
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Bin edges (dBm) for the Very Poor / Poor / Fair / Good / Excellent buckets
+QUALITY_BINS = np.array([-np.inf, -80, -70, -60, -50, np.inf])
+
+# Heat map grid density when no explicit resolution is given
+GRID_POINTS_PER_METER = 8
+MIN_RESOLUTION, MAX_RESOLUTION = 40, 100
+
+# Custom colormap: red (weak) -> yellow -> green (strong)
+_WIFI_COLORS = ['#d62728', '#ff7f0e', '#ffff00', '#90ee90', '#2ca02c']
+_WIFI_CMAP = LinearSegmentedColormap.from_list('wifi', _WIFI_COLORS, N=100)
+
+# Fewer points than this can't be meaningfully interpolated, so they are
+# plotted as-is. qhull also rejects collinear or coincident points however
+# many there are; those fall back to the same plot via QhullError
+MIN_INTERP_POINTS = 4
+
+_POINT_DTYPE = np.dtype([('x', 'f4'), ('y', 'f4'), ('s', 'f4')])
+
+def load_data(data_file='wifi_data.jsonl'):
+    """Load WiFi data from a JSON array file or a line-delimited .jsonl file."""
+    # Older versions of wifi_mapper.py saved a single JSON array instead
+    legacy_file = Path(data_file).with_suffix('.json')
+    if not Path(data_file).exists() and Path(data_file).suffix == '.jsonl' and legacy_file.exists():
+        print(f"{data_file} not found; reading {legacy_file} instead.")
+        data_file = legacy_file
+    
     if not Path(data_file).exists():
         print(f"Error: {data_file} not found.")
         print("Run wifi_mapper.py first to collect data.")
         return None
     
-    with open(data_file, 'r') as f:
-        data = json.load(f)
+    with open(data_file, 'rb') as f:
+        if Path(data_file).suffix == '.jsonl':
+            data = [_loads(line) for line in f if line.strip()]
+        else:
+            data = _loads(f.read())
     
     if len(data) == 0:
         print("No data points found in file.")
@@ -27,70 +68,252 @@ def load_data(data_file='wifi_data.json'):
     
     return data
 
-def create_heatmap(data, output_file='wifi_heatmap.png', resolution=100):
+def _extract(data, rooms=None):
+    """
+    Pull x, y and signal_dbm out of the data points in a single pass.
+    If a rooms list is given, (x, y, room) is appended to it for every
+    labelled point during the same pass.
+    """
+    def rows():
+        for p in data:
+            if rooms is not None and p.get('room'):
+                rooms.append((p['x'], p['y'], p['room']))
+            yield p['x'], p['y'], p['signal_dbm']
+    
+    arr = np.fromiter(rows(), dtype=_POINT_DTYPE, count=len(data))
+    return arr['x'], arr['y'], arr['s']
+
+@dataclass(frozen=True, slots=True)
+class Stats:
+    """Per-data-set arrays and summary numbers shared by the analysis and plots."""
+    xs: np.ndarray
+    ys: np.ndarray
+    sigs: np.ndarray
+    smin: float | None
+    smax: float | None
+    smean: float | None
+    counts: np.ndarray  # Very Poor, Poor, Fair, Good, Excellent
+    rooms: tuple        # (x, y, room) for each labelled point
+
+def compute_stats(data):
+    """
+    Extract the data points and summarize them in one pass. For empty
+    data smin, smax and smean are None and every count is zero.
+    """
+    rooms = []
+    xs, ys, sigs = _extract(data, rooms)
+    counts, _ = np.histogram(sigs, bins=QUALITY_BINS)
+    if sigs.size == 0:
+        smin = smax = smean = None
+    else:
+        smin, smax, smean = float(sigs.min()), float(sigs.max()), float(sigs.mean())
+    return Stats(
+        xs=xs, ys=ys, sigs=sigs,
+        smin=smin, smax=smax, smean=smean,
+        counts=counts, rooms=tuple(rooms)
+    )
+
+def _build_interpolator(data, stats=None):
+    """
+    Triangulate the measurement points once so the 2D and 3D views can
+    share the same Delaunay mesh instead of each rebuilding it.
+    """
+    if stats is None:
+        stats = compute_stats(data)
+    return Delaunay(np.column_stack([stats.xs, stats.ys]))
+
+def _idw_loop(qx, qy, px, py, ps, idx, out):
+    """IDW reduction over the k nearest samples of each grid point."""
+    for g in range(qx.size):
+        num = 0.0
+        den = 0.0
+        for j in range(idx.shape[1]):
+            n = idx[g, j]
+            dx = qx[g] - px[n]
+            dy = qy[g] - py[n]
+            w = 1.0 / max(dx * dx + dy * dy, 1e-12)
+            num += w * ps[n]
+            den += w
+        out[g] = num / den
+
+# Numba-compiled _idw_loop; None until first needed, False if Numba is missing
+_idw_kernel = None
+
+def _get_idw_kernel():
+    """
+    Import Numba and compile _idw_loop on the first IDW heat map, so runs
+    that never use method='idw' don't pay for either.
+    """
+    global _idw_kernel
+    if _idw_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _idw_kernel = False
+        else:
+            # Serial on purpose: Numba's parallel thread pool is not fork-safe and
+            # deadlocks the process-pool rendering in main() on exit
+            _idw_kernel = njit(fastmath=True, cache=True)(_idw_loop)
+    return _idw_kernel or None
+
+def _idw_grid(x_coords, y_coords, signals, grid_x, grid_y, k=8):
+    """
+    Inverse-distance weighted interpolation over the k nearest samples.
+    Much cheaper than the cubic spline for the handful of points a typical
+    walk-through produces.
+    """
+    tree = cKDTree(np.column_stack([x_coords, y_coords]))
+    query = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+    k = min(k, len(signals))
+    dist, idx = tree.query(query, k=k)
+    if k == 1:
+        dist, idx = dist[:, None], idx[:, None]
+    
+    kernel = _get_idw_kernel()
+    if kernel is not None:
+        out = np.empty(grid_x.size, dtype=np.float32)
+        kernel(
+            np.ascontiguousarray(query[:, 0], dtype=np.float32),
+            np.ascontiguousarray(query[:, 1], dtype=np.float32),
+            np.ascontiguousarray(x_coords, dtype=np.float32),
+            np.ascontiguousarray(y_coords, dtype=np.float32),
+            np.ascontiguousarray(signals, dtype=np.float32),
+            idx, out
+        )
+        return out.reshape(grid_x.shape)
+    
+    weights = 1.0 / np.maximum(dist, 1e-6) ** 2
+    grid_signal = (weights * signals[idx]).sum(axis=1) / weights.sum(axis=1)
+    return grid_signal.reshape(grid_x.shape).astype(np.float32)
+
+def _render_sparse(stats, output_file, projection=None, reason=None):
+    """
+    Plot a handful of points directly, without any interpolation.
+    Used when there are too few points for a surface, or when they can't
+    be triangulated; projection='3d' gives the 3D variant.
+    """
+    x_coords, y_coords, signals = stats.xs, stats.ys, stats.sigs
+    
+    if reason is None:
+        reason = f"Only {signals.size} data point(s)"
+    print(f"{reason}; plotting measurements without interpolation")
+    
+    if projection == '3d':
+        fig = plt.figure(figsize=(14, 10))
+        ax = fig.add_subplot(111, projection='3d')
+        scatter = ax.scatter(x_coords, y_coords, signals, c=signals, cmap=_WIFI_CMAP,
+                             s=100, edgecolors='black')
+        ax.set_zlabel('Signal Strength (dBm)', fontsize=10)
+        ax.set_title('WiFi Signal Strength - 3D View', fontsize=14, fontweight='bold', pad=20)
+        fig.colorbar(scatter, ax=ax, label='Signal Strength (dBm)', shrink=0.5)
+    else:
+        fig, ax = plt.subplots(figsize=(12, 10))
+        scatter = ax.scatter(x_coords, y_coords, c=signals, cmap=_WIFI_CMAP,
+                             s=100, edgecolors='black', linewidths=2, zorder=5)
+        for x, y, room in stats.rooms:
+            ax.annotate(room, (x, y), xytext=(5, 5), textcoords='offset points', fontsize=8)
+        ax.set_title('WiFi Signal Strength Heat Map', fontsize=16, fontweight='bold', pad=20)
+        ax.grid(True, alpha=0.3, linestyle='--')
+        plt.colorbar(scatter, ax=ax, label='Signal Strength (dBm)')
+    
+    ax.set_xlim(x_coords.min() - 1, x_coords.max() + 1)
+    ax.set_ylim(y_coords.min() - 1, y_coords.max() + 1)
+    ax.set_xlabel('X Position (meters)')
+    ax.set_ylabel('Y Position (meters)')
+    
+    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    print(f"✓ Plot saved to {output_file}")
+    
+    return fig
+
+def create_heatmap(data, output_file='wifi_heatmap.png', resolution=None, tri=None,
+                   method='cubic', stats=None):
     """
     Create a heat map visualization from WiFi data.
     
     Args:
         data: List of data points with x, y, and signal_dbm
         output_file: Output filename for the heat map image
-        resolution: Grid resolution for interpolation
+        resolution: Grid resolution for interpolation (default: scaled to the
+            mapped area, 8 points per meter clamped to 40-100)
+        tri: Precomputed Delaunay triangulation from _build_interpolator
+        method: 'cubic' (Clough-Tocher spline) or 'idw' (inverse distance weighting)
+        stats: Precomputed Stats from compute_stats
     """
-    # Extract coordinates and signal strengths
-    x_coords = [point['x'] for point in data]
-    y_coords = [point['y'] for point in data]
-    signals = [point['signal_dbm'] for point in data]
+    if len(data) == 0:
+        return None
+    if stats is None:
+        stats = compute_stats(data)
+    if len(data) < MIN_INTERP_POINTS:
+        return _render_sparse(stats, output_file)
+    
+    x_coords, y_coords, signals = stats.xs, stats.ys, stats.sigs
+    smin, smax, smean = stats.smin, stats.smax, stats.smean
     
     print(f"Creating heat map from {len(data)} data points...")
-    print(f"Signal range: {min(signals)} to {max(signals)} dBm")
+    print(f"Signal range: {smin:g} to {smax:g} dBm")
     
     # Create grid for interpolation
-    x_min, x_max = min(x_coords) - 1, max(x_coords) + 1
-    y_min, y_max = min(y_coords) - 1, max(y_coords) + 1
+    x_min, x_max = x_coords.min() - 1, x_coords.max() + 1
+    y_min, y_max = y_coords.min() - 1, y_coords.max() + 1
+    
+    if resolution is None:
+        span = max(x_max - x_min, y_max - y_min)
+        resolution = int(np.clip(span * GRID_POINTS_PER_METER, MIN_RESOLUTION, MAX_RESOLUTION))
     
     grid_x, grid_y = np.meshgrid(
-        np.linspace(x_min, x_max, resolution),
-        np.linspace(y_min, y_max, resolution)
+        np.linspace(x_min, x_max, resolution, dtype=np.float32),
+        np.linspace(y_min, y_max, resolution, dtype=np.float32)
     )
     
-    # Interpolate signal strength across the grid
-    grid_signal = griddata(
-        (x_coords, y_coords), 
-        signals, 
-        (grid_x, grid_y), 
-        method='cubic',
-        fill_value=min(signals)
-    )
+    # Interpolate signal strength across the grid (float32 end-to-end)
+    if method == 'idw':
+        grid_signal = _idw_grid(x_coords, y_coords, signals, grid_x, grid_y)
+    else:
+        if tri is None:
+            try:
+                tri = _build_interpolator(data, stats)
+            except QhullError:
+                return _render_sparse(stats, output_file,
+                                      reason="Data points can't be triangulated (collinear or coincident)")
+        interp_cubic = CloughTocher2DInterpolator(tri, signals, fill_value=smin)
+        grid_signal = interp_cubic(grid_x, grid_y).astype(np.float32)
     
     # Create the plot
     fig, ax = plt.subplots(figsize=(12, 10))
     
-    # Custom colormap: red (weak) -> yellow -> green (strong)
-    colors = ['#d62728', '#ff7f0e', '#ffff00', '#90ee90', '#2ca02c']
-    n_bins = 100
-    cmap = LinearSegmentedColormap.from_list('wifi', colors, N=n_bins)
-    
     # Create heat map
-    heatmap = ax.contourf(grid_x, grid_y, grid_signal, levels=20, cmap=cmap, alpha=0.8)
+    heatmap = ax.pcolormesh(grid_x, grid_y, grid_signal, shading='nearest', cmap=_WIFI_CMAP, alpha=0.8)
     
-    # Add contour lines
-    contours = ax.contour(grid_x, grid_y, grid_signal, levels=10, colors='black', alpha=0.3, linewidths=0.5)
-    ax.clabel(contours, inline=True, fontsize=8, fmt='%d dBm')
+    # Add contour lines, traced on the triangulated samples rather than the dense grid
+    mesh = None
+    if tri is not None:
+        mesh = Triangulation(x_coords, y_coords, tri.simplices)
+    else:
+        try:
+            mesh = Triangulation(x_coords, y_coords)
+        except (RuntimeError, ValueError):
+            # matplotlib rejects collinear samples and fewer than three distinct
+            # positions; IDW doesn't need a mesh, so keep the heat map and just
+            # leave out the contours
+            print("Data points can't be triangulated (collinear or coincident); skipping contour lines")
+    if mesh is not None:
+        contours = ax.tricontour(mesh, signals, levels=10, colors='black', alpha=0.3, linewidths=0.5)
+        ax.clabel(contours, inline=True, fontsize=8, fmt='%d dBm')
     
     # Plot actual measurement points
-    scatter = ax.scatter(x_coords, y_coords, c=signals, cmap=cmap, 
+    scatter = ax.scatter(x_coords, y_coords, c=signals, cmap=_WIFI_CMAP, 
                         s=100, edgecolors='black', linewidths=2, 
                         marker='o', zorder=5, alpha=0.9)
     
     # Add room labels if available
-    for point in data:
-        if point.get('room'):
-            ax.annotate(point['room'], 
-                       (point['x'], point['y']),
-                       xytext=(5, 5), 
-                       textcoords='offset points',
-                       fontsize=8,
-                       bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7))
+    for x, y, room in stats.rooms:
+        ax.annotate(room, 
+                   (x, y),
+                   xytext=(5, 5), 
+                   textcoords='offset points',
+                   fontsize=8,
+                   bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.7))
     
     # Add colorbar
     cbar = plt.colorbar(heatmap, ax=ax, label='Signal Strength (dBm)')
@@ -104,7 +327,7 @@ def create_heatmap(data, output_file='wifi_heatmap.png', resolution=100):
     }
     
     for level, label in quality_levels.items():
-        if min(signals) <= level <= max(signals):
+        if smin <= level <= smax:
             cbar.ax.plot([0, 1], [level, level], 'k--', linewidth=1, alpha=0.5)
             cbar.ax.text(1.1, level, label, va='center', fontsize=8)
     
@@ -119,52 +342,47 @@ def create_heatmap(data, output_file='wifi_heatmap.png', resolution=100):
     
     # Add statistics box
     stats_text = f"Data Points: {len(data)}\n"
-    stats_text += f"Best Signal: {max(signals)} dBm\n"
-    stats_text += f"Worst Signal: {min(signals)} dBm\n"
-    stats_text += f"Average: {np.mean(signals):.1f} dBm"
+    stats_text += f"Best Signal: {smax:g} dBm\n"
+    stats_text += f"Worst Signal: {smin:g} dBm\n"
+    stats_text += f"Average: {smean:.1f} dBm"
     
     ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
             fontsize=10, verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=150, bbox_inches='tight')
     print(f"✓ Heat map saved to {output_file}")
     
     return fig
 
-def create_3d_visualization(data, output_file='wifi_3d.png'):
+def create_3d_visualization(data, output_file='wifi_3d.png', tri=None, stats=None):
     """Create a 3D surface plot of WiFi signal strength."""
     from mpl_toolkits.mplot3d import Axes3D
     
-    x_coords = [point['x'] for point in data]
-    y_coords = [point['y'] for point in data]
-    signals = [point['signal_dbm'] for point in data]
+    if len(data) == 0:
+        return None
+    if stats is None:
+        stats = compute_stats(data)
+    if len(data) < MIN_INTERP_POINTS:
+        return _render_sparse(stats, output_file, projection='3d')
     
-    # Create grid
-    x_min, x_max = min(x_coords) - 1, max(x_coords) + 1
-    y_min, y_max = min(y_coords) - 1, max(y_coords) + 1
+    x_coords, y_coords, signals = stats.xs, stats.ys, stats.sigs
     
-    grid_x, grid_y = np.meshgrid(
-        np.linspace(x_min, x_max, 50),
-        np.linspace(y_min, y_max, 50)
-    )
-    
-    grid_signal = griddata(
-        (x_coords, y_coords), 
-        signals, 
-        (grid_x, grid_y), 
-        method='cubic',
-        fill_value=min(signals)
-    )
+    if tri is None:
+        try:
+            tri = _build_interpolator(data, stats)
+        except QhullError:
+            return _render_sparse(stats, output_file, projection='3d',
+                                  reason="Data points can't be triangulated (collinear or coincident)")
     
     # Create 3D plot
     fig = plt.figure(figsize=(14, 10))
     ax = fig.add_subplot(111, projection='3d')
     
-    # Surface plot
-    surf = ax.plot_surface(grid_x, grid_y, grid_signal, cmap='RdYlGn', 
-                          alpha=0.8, edgecolor='none')
+    # Surface plot straight on the Delaunay mesh, no interpolated grid
+    surf = ax.plot_trisurf(x_coords, y_coords, signals, triangles=tri.simplices,
+                           cmap=_WIFI_CMAP, alpha=0.8, edgecolor='none')
     
     # Scatter plot of actual points
     ax.scatter(x_coords, y_coords, signals, c='black', s=50, alpha=0.6)
@@ -178,33 +396,40 @@ def create_3d_visualization(data, output_file='wifi_3d.png'):
     # Colorbar
     fig.colorbar(surf, ax=ax, label='Signal Strength (dBm)', shrink=0.5)
     
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=150, bbox_inches='tight')
     print(f"✓ 3D visualization saved to {output_file}")
     
     return fig
 
-def analyze_dead_zones(data, threshold=-75):
+def analyze_dead_zones(data, threshold=-75, stats=None):
     """
     Analyze and report dead zones (areas with signal below threshold).
     
     Args:
         data: WiFi data points
         threshold: Signal strength threshold for dead zones (default: -75 dBm)
+        stats: Precomputed Stats from compute_stats
     """
     print(f"\n{'='*60}")
     print("Dead Zone Analysis")
     print(f"{'='*60}")
     print(f"Threshold: {threshold} dBm")
     
-    dead_zones = [point for point in data if point['signal_dbm'] < threshold]
-    good_zones = [point for point in data if point['signal_dbm'] >= -60]
+    if stats is None:
+        stats = compute_stats(data)
+    signals = stats.sigs
+    very_poor, poor, fair, good, excellent = stats.counts
+    
+    dead_mask = signals < threshold
+    dead_zones = [data[i] for i in np.flatnonzero(dead_mask)]
+    good_idx = np.flatnonzero(signals >= -60)
     
     print(f"\n📊 Signal Quality Breakdown:")
-    print(f"   Excellent (≥-50 dBm): {len([p for p in data if p['signal_dbm'] >= -50])}")
-    print(f"   Good (-50 to -60 dBm): {len([p for p in data if -60 <= p['signal_dbm'] < -50])}")
-    print(f"   Fair (-60 to -70 dBm): {len([p for p in data if -70 <= p['signal_dbm'] < -60])}")
-    print(f"   Poor (-70 to -80 dBm): {len([p for p in data if -80 <= p['signal_dbm'] < -70])}")
-    print(f"   Very Poor (<-80 dBm): {len([p for p in data if p['signal_dbm'] < -80])}")
+    print(f"   Excellent (≥-50 dBm): {excellent}")
+    print(f"   Good (-50 to -60 dBm): {good}")
+    print(f"   Fair (-60 to -70 dBm): {fair}")
+    print(f"   Poor (-70 to -80 dBm): {poor}")
+    print(f"   Very Poor (<-80 dBm): {very_poor}")
     
     if dead_zones:
         print(f"\n⚠️  Found {len(dead_zones)} dead zone location(s):")
@@ -215,26 +440,38 @@ def analyze_dead_zones(data, threshold=-75):
     else:
         print(f"\n✓ No dead zones found! All areas have signal ≥ {threshold} dBm")
     
-    if good_zones:
+    if good_idx.size:
         print(f"\n✓ Best coverage areas:")
-        # Sort by signal strength
-        good_zones_sorted = sorted(good_zones, key=lambda x: x['signal_dbm'], reverse=True)[:3]
-        for i, point in enumerate(good_zones_sorted, 1):
+        # Partial sort: only the top 3 need ordering by signal strength. Keep
+        # every point tied with the 3rd best so ties go to the earliest sample
+        k = min(3, good_idx.size)
+        kth = np.partition(signals[good_idx], -k)[-k]
+        top = good_idx[signals[good_idx] >= kth]
+        top = top[np.argsort(-signals[top], kind='stable')[:k]]
+        for i, point in enumerate((data[j] for j in top), 1):
             location = f"({point['x']}, {point['y']})"
             room = f" - {point['room']}" if point.get('room') else ""
             print(f"   {i}. {location}{room}: {point['signal_dbm']} dBm")
     
     print(f"\n{'='*60}\n")
 
+def _render(plot_func, *args, **kwargs):
+    """Run a plotting function in a worker process without shipping the figure back."""
+    fig = plot_func(*args, **kwargs)
+    if fig is not None:
+        plt.close(fig)
+
 def main():
     """Main visualization function."""
     import argparse
     
     parser = argparse.ArgumentParser(description='Visualize WiFi signal strength data')
-    parser.add_argument('--data', default='wifi_data.json', help='Input data file')
+    parser.add_argument('--data', default='wifi_data.jsonl', help='Input data file (.json or .jsonl)')
     parser.add_argument('--output', default='wifi_heatmap.png', help='Output image file')
     parser.add_argument('--3d', action='store_true', help='Also create 3D visualization')
     parser.add_argument('--threshold', type=int, default=-75, help='Dead zone threshold (dBm)')
+    parser.add_argument('--method', choices=['cubic', 'idw'], default='cubic',
+                        help='Heat map interpolation method')
     
     args = parser.parse_args()
     
@@ -243,15 +480,43 @@ def main():
     if data is None:
         return
     
-    # Analyze dead zones
-    analyze_dead_zones(data, args.threshold)
-    
-    # Create heat map
-    create_heatmap(data, args.output)
+    # Extract and summarize once for the analysis and both plots
+    stats = compute_stats(data)
     
-    # Create 3D visualization if requested
-    if args.__dict__.get('3d', False):
-        create_3d_visualization(data, 'wifi_3d.png')
+    # Analyze dead zones
+    analyze_dead_zones(data, args.threshold, stats=stats)
+    
+    make_3d = args.__dict__.get('3d', False)
+    
+    # Triangulate once and share it between the 2D and 3D views
+    tri = None
+    if len(data) >= MIN_INTERP_POINTS and (args.method == 'cubic' or make_3d):
+        try:
+            tri = _build_interpolator(data, stats)
+        except QhullError:
+            # Collinear samples; each view falls back to a plain scatter
+            tri = None
+    
+    if make_3d:
+        renders = [
+            (create_heatmap, (data, args.output), {'tri': tri, 'method': args.method, 'stats': stats}),
+            (create_3d_visualization, (data, 'wifi_3d.png'), {'tri': tri, 'stats': stats}),
+        ]
+        # The two figures are independent, so render them side by side. Only
+        # worth it with fork: spawn/forkserver workers re-import numpy, scipy
+        # and matplotlib, which costs more than the second render itself
+        if multiprocessing.get_start_method() == 'fork' and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                jobs = [pool.submit(_render, func, *fargs, **fkwargs)
+                        for func, fargs, fkwargs in renders]
+                for job in jobs:
+                    job.result()
+        else:
+            for func, fargs, fkwargs in renders:
+                _render(func, *fargs, **fkwargs)
+    else:
+        # Create heat map
+        create_heatmap(data, args.output, tri=tri, method=args.method, stats=stats)
     
     print("\n✓ Visualization complete!")
     print(f"  View your heat map: {args.output}")